@@ -4,15 +4,179 @@
 Версия без API - генерирует структурированные данные для ручного анализа
 """
 
+import asyncio
+import hashlib
+import heapq
+import math
+import os
+import re
 import feedparser
 import yaml
-import json
+import orjson
 import shutil
-from datetime import datetime, timedelta
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from calendar import timegm
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
-import pytz
+from operator import itemgetter
+from urllib.parse import quote, urlsplit, urlunsplit, parse_qsl, urlencode
+from zoneinfo import ZoneInfo
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML собран без libyaml: чистый Python, медленнее
+    from yaml import SafeLoader
+
+try:
+    import aiohttp
+except ImportError:  # без aiohttp фиды загружаются в пуле потоков
+    aiohttp = None
+
+try:
+    import ahocorasick
+except ImportError:  # без pyahocorasick ключевые слова ищутся регулярными выражениями
+    ahocorasick = None
+
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:  # без datasketch похожие заголовки не объединяются
+    MinHash = MinHashLSH = None
+
+# Параметры загрузки фидов
+FETCH_TIMEOUT = 15       # секунд на один фид
+FETCH_CONCURRENCY = 20   # одновременных запросов
+FETCH_MAX_THREADS = 32   # потоков в запасном (синхронном) режиме
+FETCH_RETRIES = 2        # повторов при сетевой ошибке или ответе 5xx
+FETCH_BACKOFF = 0.3      # секунд до первого повтора, дальше вдвое больше
+FETCH_DNS_TTL = 300      # секунд кэша DNS на весь запуск (по умолчанию 10)
+
+# Старых записей подряд после свежих, после которых хвост ленты не разбирается
+FEED_STALE_ENTRIES = 3
+
+# Кэш ETag/Last-Modified и статей по каждому фиду (для условных запросов)
+FEED_CACHE_PATH = "reports/.feed_cache.json"
+
+# Фильтр Блума для URL из прошлых запусков (filters.skip_seen_urls)
+SEEN_URLS_PATH = "reports/.seen_urls.bloom"
+SEEN_URLS_CAPACITY = 1_000_000
+SEEN_URLS_ERROR_RATE = 1e-6
+
+# Объединение почти одинаковых заголовков (MinHash + LSH)
+NEAR_DUPLICATE_THRESHOLD = 0.75   # по умолчанию, см. filters.near_duplicate_threshold
+MINHASH_NUM_PERM = 64
+TITLE_SHINGLE_SIZE = 5
+TITLE_MIN_SHINGLES = 16   # короче (пустые, 'Видео') не объединяются
+
+# С какого числа ключевых слов использовать Hyperscan (если установлен)
+HYPERSCAN_MIN_KEYWORDS = 200
+
+GOOGLE_NEWS_URL = 'https://news.google.com/rss/search?q={}&hl=ru&gl=RU&ceid=RU:ru'
+
+# Неизменная концовка текстового отчета (собирается один раз при импорте)
+REPORT_FOOTER = (
+    f"\n{'='*70}\n"
+    "СЛЕДУЮЩИЙ ШАГ: АНАЛИЗ\n"
+    f"{'='*70}\n\n"
+    "Для кластеризации и оценки значимости:\n\n"
+    "1. Загрузите файл raw_articles_latest.json в чат с Claude\n"
+    "2. Загрузите файл criteria.yaml для контекста\n"
+    "3. Попросите Claude:\n"
+    '   "Проанализируй эти новости используя критерии из criteria.yaml.\n'
+    '    Сгруппируй по темам, оцени значимость каждой темы, создай отчет."\n\n'
+    "4. Claude создаст структурированный отчет с оценками\n"
+    "5. Сохраните результат как analyzed_digest_[дата].txt\n\n"
+)
+
+
+def _is_word_char(text: str, pos: int) -> bool:
+    """Символ слова в смысле \\w регулярных выражений (вне строки — нет)"""
+    if pos < 0 or pos >= len(text):
+        return False
+    ch = text[pos]
+    return ch.isalnum() or ch == '_'
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Совпадение text[start:end] ограничено \\b с обеих сторон"""
+    return (_is_word_char(text, start - 1) != _is_word_char(text, start) and
+            _is_word_char(text, end - 1) != _is_word_char(text, end))
+
+
+def canonical_url(url: str) -> str:
+    """URL без utm_*-параметров и фрагмента (ключ для поиска дубликатов)"""
+    if 'utm_' not in url and '#' not in url:
+        return url
+    
+    parts = urlsplit(url)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.startswith('utm_')
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def utc_datetime(timestamp: float) -> datetime:
+    """Unix-время → datetime в UTC без часового пояса (как даты feedparser)"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def search_text(title: str, description: str) -> str:
+    """Текст статьи в нижнем регистре для поиска ключевых слов"""
+    return f"{title} {description}".lower()
+
+
+def public_fields(article: dict) -> dict:
+    """Статья без служебных полей (с '_' в начале) для сохранения на диск"""
+    return {k: v for k, v in article.items() if not k.startswith('_')}
+
+
+class BloomFilter:
+    """Фильтр Блума: компактное множество строк с редкими ложными срабатываниями"""
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.num_bits = int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, key: str):
+        # k независимых 32-битных хешей из одного дайджеста SHAKE-128
+        digest = hashlib.shake_128(key.encode('utf-8')).digest(4 * self.num_hashes)
+        return [
+            int.from_bytes(digest[i:i + 4], 'little') % self.num_bits
+            for i in range(0, len(digest), 4)
+        ]
+    
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+    
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+    
+    @classmethod
+    def load(cls, path: str, capacity: int, error_rate: float) -> 'BloomFilter':
+        """Загрузка с диска; при смене параметров начинаем с пустого фильтра"""
+        bloom = cls(capacity, error_rate)
+        try:
+            data = Path(path).read_bytes()
+        except FileNotFoundError:
+            return bloom
+        if len(data) == len(bloom.bits):
+            bloom.bits = bytearray(data)
+        return bloom
+    
+    def save(self, path: str):
+        """Атомарное сохранение на диск"""
+        tmp_path = path + '.tmp'
+        Path(tmp_path).write_bytes(self.bits)
+        os.replace(tmp_path, path)
+
 
 class NewsAggregator:
     """Агрегатор новостей из RSS с фильтрацией и группировкой"""
@@ -23,12 +187,36 @@ class NewsAggregator:
         
         # Создаем директорию для отчетов
         Path("reports").mkdir(exist_ok=True)
+        
+        # Московское время для отчетов и имен файлов (фиксируется в начале запуска)
+        self.tz = ZoneInfo('Europe/Moscow')
+        self._set_run_time()
+        
+        # Кэш фидов с прошлого запуска и кэш, собираемый в текущем
+        self._reset_feed_cache()
+        
+        # URL из прошлых запусков (только если включено в filters.skip_seen_urls)
+        if self.feeds_config.get('filters', {}).get('skip_seen_urls', False):
+            self.seen_urls = BloomFilter.load(SEEN_URLS_PATH, SEEN_URLS_CAPACITY, SEEN_URLS_ERROR_RATE)
+        else:
+            self.seen_urls = None
+    
+    def _set_run_time(self):
+        """Фиксируем время запуска: одно и то же во всех отчетах и именах файлов"""
+        self._now = datetime.now(self.tz)
+        self._ts_str = self._now.strftime('%Y-%m-%d_%H-%M')
+    
+    def _reset_feed_cache(self):
+        """Кэш фидов с прошлого запуска; кэш текущего запуска собирается заново"""
+        self.feed_cache = self.load_feed_cache()
+        self._next_feed_cache = {}
+        self._validators = {}
     
     def load_config(self, config_path: str) -> dict:
         """Загрузка YAML конфигурации"""
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=SafeLoader)
             print(f"✓ Конфигурация загружена: {config_path}")
             return config
         except FileNotFoundError:
@@ -38,6 +226,81 @@ class NewsAggregator:
             print(f"✗ Ошибка парсинга YAML: {e}")
             raise
     
+    def load_feed_cache(self) -> dict:
+        """Загрузка кэша фидов с прошлого запуска"""
+        try:
+            return orjson.loads(Path(FEED_CACHE_PATH).read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return {}
+    
+    def save_feed_cache(self):
+        """Атомарное сохранение кэша фидов"""
+        tmp_path = FEED_CACHE_PATH + '.tmp'
+        Path(tmp_path).write_bytes(orjson.dumps(self._next_feed_cache))
+        os.replace(tmp_path, FEED_CACHE_PATH)
+    
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Заголовки If-None-Match / If-Modified-Since для фида из кэша"""
+        cached = self.feed_cache.get(url, {})
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('modified'):
+            headers['If-Modified-Since'] = cached['modified']
+        return headers
+    
+    def _remember_validators(self, url: str, etag: str, modified: str):
+        """Запоминаем ETag/Last-Modified фида для следующего запуска"""
+        if etag or modified:
+            self._validators[url] = {'etag': etag, 'modified': modified}
+    
+    def _keep_validators(self, url: str):
+        """Фид не изменился (HTTP 304) — переносим его ETag/Last-Modified из кэша"""
+        cached = self.feed_cache.get(url, {})
+        self._remember_validators(url, cached.get('etag'), cached.get('modified'))
+    
+    def remember_feed(self, url: str, articles: List[dict]):
+        """Сохраняем статьи фида в кэш вместе с его ETag/Last-Modified"""
+        validators = self._validators.pop(url, None)
+        if validators is None:
+            return
+        self._next_feed_cache[url] = {
+            **validators,
+            'articles': [public_fields(a) for a in articles]
+        }
+    
+    def get_cached_articles(self, url: str, hours_back: int) -> List[dict]:
+        """Статьи неизменившегося фида (HTTP 304) из кэша прошлого запуска"""
+        cutoff_time = utc_datetime(time.time()) - timedelta(hours=hours_back)
+        cached = self.feed_cache.get(url, {})
+        
+        articles = []
+        for article in cached.get('articles', []):
+            pub_date = datetime.fromisoformat(article['published'])
+            # Старые статьи могли выйти за границу периода
+            if pub_date > cutoff_time:
+                # Копия: кэш прошлого запуска остается нетронутым
+                articles.append({
+                    **article,
+                    '_pub_dt': pub_date,
+                    '_text_lc': search_text(article['title'], article['description'])
+                })
+        return articles
+    
+    def skip_seen(self, articles: List[dict]) -> List[dict]:
+        """Отбрасываем статьи, URL которых уже встречались в прошлых запусках"""
+        if self.seen_urls is None:
+            return articles
+        
+        fresh = []
+        for article in articles:
+            url = canonical_url(article['url'])
+            if url in self.seen_urls:
+                continue
+            self.seen_urls.add(url)
+            fresh.append(article)
+        return fresh
+    
     def get_enabled_feeds(self) -> Dict[str, dict]:
         """Получение всех активных RSS-фидов"""
         feeds = {}
@@ -54,35 +317,163 @@ class NewsAggregator:
         
         return feeds
     
-    def fetch_rss_feed(self, source_name: str, feed_url: str, hours_back: int) -> List[dict]:
-        """Получение новостей из одного RSS-фида"""
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+    def _response_headers(self, content_type: Optional[str], final_url: str) -> Dict[str, str]:
+        """Заголовки ответа для feedparser: кодировка и адрес для относительных ссылок"""
+        headers = {'content-location': final_url}
+        if content_type:
+            headers['content-type'] = content_type
+        return headers
+    
+    async def _fetch_bytes(self, session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore,
+                           url: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Загрузка одного фида (без парсинга), с повторами при сбоях"""
+        async with semaphore:
+            for attempt in range(FETCH_RETRIES + 1):
+                last = attempt == FETCH_RETRIES
+                try:
+                    async with session.get(url, headers=self._conditional_headers(url)) as response:
+                        if response.status == 304:
+                            self._keep_validators(url)
+                            return None
+                        if response.status < 500 or last:
+                            response.raise_for_status()
+                            body = await response.read()
+                            self._remember_validators(url, response.headers.get('ETag'),
+                                                      response.headers.get('Last-Modified'))
+                            return body, self._response_headers(
+                                response.headers.get('Content-Type'), str(response.url))
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if last:
+                        raise
+                await asyncio.sleep(FETCH_BACKOFF * 2 ** attempt)
+    
+    async def _fetch_all(self, urls: List[str]) -> Dict[str, object]:
+        """Параллельная загрузка всех фидов: url → (содержимое, заголовки),
+        None (не изменился) или исключение"""
+        timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        
+        headers = {'User-Agent': feedparser.USER_AGENT}
+        
+        # Одна сессия на все фиды: соединения с хостом переиспользуются
+        # (keep-alive), адреса резолвятся один раз за запуск
+        connector = aiohttp.TCPConnector(ttl_dns_cache=FETCH_DNS_TTL)
+        
+        async with aiohttp.ClientSession(timeout=timeout, headers=headers,
+                                         connector=connector) as session:
+            results = await asyncio.gather(
+                *[self._fetch_bytes(session, semaphore, url) for url in urls],
+                return_exceptions=True
+            )
+        
+        return dict(zip(urls, results))
+    
+    def _download(self, url: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Синхронная загрузка одного фида, с повторами при сбоях"""
+        headers = {'User-Agent': feedparser.USER_AGENT, **self._conditional_headers(url)}
+        request = urllib.request.Request(url, headers=headers)
+        for attempt in range(FETCH_RETRIES + 1):
+            last = attempt == FETCH_RETRIES
+            try:
+                with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+                    body = response.read()
+                    self._remember_validators(url, response.headers.get('ETag'),
+                                              response.headers.get('Last-Modified'))
+                    return body, self._response_headers(
+                        response.headers.get('Content-Type'), response.geturl())
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    self._keep_validators(url)
+                    return None
+                if e.code < 500 or last:
+                    raise
+            except OSError:  # URLError, таймауты, обрывы соединения
+                if last:
+                    raise
+            time.sleep(FETCH_BACKOFF * 2 ** attempt)
+    
+    def _fetch_all_threaded(self, urls: List[str]) -> Dict[str, object]:
+        """Загрузка всех фидов в пуле потоков (если aiohttp не установлен)"""
+        results = {}
+        if not urls:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(FETCH_MAX_THREADS, len(urls))) as executor:
+            futures = {executor.submit(self._download, url): url for url in urls}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+        
+        return results
+    
+    def download_feeds(self, urls: List[str]) -> Dict[str, object]:
+        """Загрузка списка фидов одним пакетом"""
+        urls = list(dict.fromkeys(urls))
+        if aiohttp is None:
+            return self._fetch_all_threaded(urls)
+        return asyncio.run(self._fetch_all(urls))
+    
+    def get_google_news_urls(self) -> Dict[str, str]:
+        """URL поиска Google News для каждой темы: тема → url"""
+        google_config = self.feeds_config.get('google_news', {})
+        
+        if not google_config.get('enabled', False):
+            return {}
+        
+        return {
+            topic: GOOGLE_NEWS_URL.format(quote(topic))
+            for topic in google_config.get('topics', [])
+        }
+    
+    def fetch_rss_feed(self, source_name: str, body: bytes, headers: Dict[str, str],
+                       hours_back: int) -> List[dict]:
+        """Разбор одного загруженного RSS-фида"""
+        # Сравниваем числа (Unix-время), а не объекты datetime
+        now_ts = time.time()
+        cutoff_ts = now_ts - hours_back * 3600
         articles = []
         
         try:
-            feed = feedparser.parse(feed_url)
+            # Кодировка из Content-Type и адрес фида для относительных ссылок —
+            # то, что feedparser.parse(url) брал из ответа сам
+            feed = feedparser.parse(body, response_headers=headers)
+            stale = 0
             
             for entry in feed.entries:
-                # Парсим дату публикации
-                try:
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        pub_date = datetime(*entry.published_parsed[:6])
-                    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                        pub_date = datetime(*entry.updated_parsed[:6])
-                    else:
-                        pub_date = datetime.now()
-                except:
-                    pub_date = datetime.now()
+                # Метод get связываем один раз на запись.
+                # <description> feedparser сам кладет в 'summary'
+                entry_get = entry.get
+                
+                # Парсим дату публикации (без даты — текущее время)
+                parsed = entry_get('published_parsed') or entry_get('updated_parsed')
+                pub_ts = timegm(parsed) if parsed else now_ts
                 
                 # Фильтруем по времени
-                if pub_date > cutoff_time:
-                    articles.append({
-                        'title': entry.title,
-                        'url': entry.link,
-                        'source': source_name,
-                        'published': pub_date.isoformat(),
-                        'description': entry.get('summary', entry.get('description', ''))
-                    })
+                if pub_ts <= cutoff_ts:
+                    # Лента идет от новых к старым (свежие записи уже были):
+                    # несколько старых подряд — дальше только архив
+                    if articles:
+                        stale += 1
+                        if stale >= FEED_STALE_ENTRIES:
+                            break
+                    continue
+                stale = 0
+                
+                # datetime создаем только для попавших в отчет записей
+                pub_date = utc_datetime(pub_ts)
+                title = entry_get('title') or ''
+                description = entry_get('summary') or ''
+                articles.append({
+                    'title': title,
+                    'url': entry_get('link') or '',
+                    'source': source_name,
+                    'published': pub_date.isoformat(),
+                    'description': description,
+                    '_pub_dt': pub_date,
+                    '_text_lc': search_text(title, description)
+                })
             
             return articles
             
@@ -90,7 +481,7 @@ class NewsAggregator:
             print(f"✗ {source_name:30} → Ошибка: {str(e)[:50]}")
             return []
     
-    def fetch_all_news(self, hours_back: int = None) -> List[dict]:
+    def fetch_all_news(self, hours_back: int = None, bodies: Dict[str, object] = None) -> List[dict]:
         """Сбор новостей из всех активных фидов"""
         if hours_back is None:
             hours_back = self.feeds_config.get('filters', {}).get('hours_back', 24)
@@ -98,27 +489,46 @@ class NewsAggregator:
         all_articles = []
         feeds = self.get_enabled_feeds()
         
+        if bodies is None:
+            bodies = self.download_feeds([d['url'] for d in feeds.values()])
+        
         print(f"\n{'─'*70}")
         print(f"Сбор новостей из {len(feeds)} источников")
         print(f"Период: последние {hours_back} часов")
         print(f"{'─'*70}\n")
         
         for source_name, feed_data in feeds.items():
-            articles = self.fetch_rss_feed(source_name, feed_data['url'], hours_back)
+            response = bodies[feed_data['url']]
+            if response is None:
+                # Фид не изменился с прошлого запуска (HTTP 304)
+                articles = self.get_cached_articles(feed_data['url'], hours_back)
+            elif isinstance(response, Exception):
+                print(f"✗ {source_name:30} → Ошибка: {str(response)[:50]}")
+                articles = []
+            else:
+                articles = self.fetch_rss_feed(source_name, *response, hours_back)
+            
+            # Добавляем теги к каждой статье
+            for article in articles:
+                article['tags'] = feed_data.get('tags', [])
+                article['category'] = feed_data.get('category', 'unknown')
+            
+            self.remember_feed(feed_data['url'], articles)
+            fetched = len(articles)
+            articles = self.skip_seen(articles)
             
             if articles:
-                # Добавляем теги к каждой статье
-                for article in articles:
-                    article['tags'] = feed_data.get('tags', [])
-                    article['category'] = feed_data.get('category', 'unknown')
-                
                 all_articles.extend(articles)
-                print(f"✓ {source_name:30} → {len(articles):3} статей")
+                unchanged = " (без изменений)" if response is None else ""
+                print(f"✓ {source_name:30} → {len(articles):3} статей{unchanged}")
+            elif fetched:
+                # Фид в порядке, просто все его статьи уже были в прошлых отчетах
+                print(f"✓ {source_name:30} →   0 новых (все {fetched} уже были)")
             else:
                 print(f"✗ {source_name:30} →   0 статей")
         
-        # Удаляем дубликаты по URL
-        unique_articles = {a['url']: a for a in all_articles}.values()
+        # Удаляем дубликаты по URL (без utm_*-меток)
+        unique_articles = {canonical_url(a['url']): a for a in all_articles}.values()
         
         print(f"\n{'─'*70}")
         print(f"Всего собрано: {len(all_articles)} статей")
@@ -127,126 +537,301 @@ class NewsAggregator:
         
         return list(unique_articles)
     
-    def fetch_google_news(self, hours_back: int) -> List[dict]:
+    def fetch_google_news(self, hours_back: int, bodies: Dict[str, object] = None) -> List[dict]:
         """Дополнительный поиск через Google News RSS"""
-        google_config = self.feeds_config.get('google_news', {})
-        
-        if not google_config.get('enabled', False):
+        topic_urls = self.get_google_news_urls()
+        if not topic_urls:
             return []
         
-        topics = google_config.get('topics', [])
-        if not topics:
-            return []
+        if bodies is None:
+            bodies = self.download_feeds(list(topic_urls.values()))
         
-        google_news_base = 'https://news.google.com/rss/search?q={}&hl=ru&gl=RU&ceid=RU:ru'
         articles = []
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        now_ts = time.time()
+        cutoff_ts = now_ts - hours_back * 3600
         
         print(f"{'─'*70}")
         print(f"Дополнительный поиск: Google News")
         print(f"{'─'*70}\n")
         
-        for topic in topics:
-            try:
-                url = google_news_base.format(topic)
-                feed = feedparser.parse(url)
-                count = 0
-                
-                for entry in feed.entries[:20]:  # Максимум 20 на тему
-                    try:
-                        pub_date = datetime(*entry.published_parsed[:6])
-                    except:
-                        pub_date = datetime.now()
+        for topic, url in topic_urls.items():
+            response = bodies[url]
+            topic_articles = []
+            
+            if response is None:
+                # Выдача не изменилась с прошлого запуска (HTTP 304)
+                topic_articles = self.get_cached_articles(url, hours_back)
+                print(f"✓ '{topic}' → {len(topic_articles)} статей (без изменений)")
+            elif isinstance(response, Exception):
+                print(f"✗ '{topic}' → Ошибка: {str(response)[:50]}")
+            else:
+                try:
+                    body, headers = response
+                    feed = feedparser.parse(body, response_headers=headers)
                     
-                    if pub_date > cutoff_time:
-                        articles.append({
-                            'title': entry.title,
-                            'url': entry.link,
-                            'source': 'Google News',
-                            'published': pub_date.isoformat(),
-                            'description': entry.get('summary', ''),
-                            'tags': ['google_news'],
-                            'category': 'google_news',
-                            'search_topic': topic
-                        })
-                        count += 1
-                
-                print(f"✓ '{topic}' → {count} статей")
-                
-            except Exception as e:
-                print(f"✗ '{topic}' → Ошибка: {str(e)[:50]}")
+                    # Выдача поиска упорядочена по релевантности, а не по дате,
+                    # поэтому здесь не обрываем цикл, а берем первые 20
+                    for entry in feed.entries[:20]:  # Максимум 20 на тему
+                        entry_get = entry.get
+                        parsed = entry_get('published_parsed') or entry_get('updated_parsed')
+                        pub_ts = timegm(parsed) if parsed else now_ts
+                        
+                        if pub_ts > cutoff_ts:
+                            pub_date = utc_datetime(pub_ts)
+                            title = entry_get('title') or ''
+                            description = entry_get('summary') or ''
+                            topic_articles.append({
+                                'title': title,
+                                'url': entry_get('link') or '',
+                                'source': 'Google News',
+                                'published': pub_date.isoformat(),
+                                'description': description,
+                                'tags': ['google_news'],
+                                'category': 'google_news',
+                                'search_topic': topic,
+                                '_pub_dt': pub_date,
+                                '_text_lc': search_text(title, description)
+                            })
+                    
+                    print(f"✓ '{topic}' → {len(topic_articles)} статей")
+                    
+                except Exception as e:
+                    print(f"✗ '{topic}' → Ошибка: {str(e)[:50]}")
+            
+            self.remember_feed(url, topic_articles)
+            articles.extend(self.skip_seen(topic_articles))
         
         print(f"\nGoogle News: {len(articles)} статей\n")
         return articles
 
-    def filter_by_keywords(self, articles: List[dict]) -> List[dict]:
-        """Фильтрация по ключевым словам"""
-        import re
+    def _build_keyword_matcher(self, keywords: List[str]):
+        """Функция поиска ключевых слов (целыми словами) в тексте в нижнем регистре"""
+        if len(keywords) >= HYPERSCAN_MIN_KEYWORDS:
+            try:
+                match = self._build_hyperscan_matcher(keywords)
+            except ImportError:
+                match = None
+            if match is not None:
+                return match
+        if ahocorasick is not None:
+            return self._build_ahocorasick_matcher(keywords)
+        return self._build_regex_matcher(keywords)
+    
+    def _build_hyperscan_matcher(self, keywords: List[str]):
+        """База Hyperscan (SIMD) для больших списков ключевых слов (None — не собралась)"""
+        import hyperscan
+        
+        index = defaultdict(list)
+        for i, kw in enumerate(keywords):
+            index[kw.lower()].append(i)
+        
+        # id выражения → индексы ключевых слов с таким написанием
+        ids = list(index.values())
+        # \b для Unicode Hyperscan не поддерживает: ищем подстроки с началом
+        # совпадения, а границы слов проверяем сами
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SOM_LEFTMOST
+        
+        database = hyperscan.Database()
+        try:
+            database.compile(
+                expressions=[re.escape(kw).encode('utf-8') for kw in index],
+                ids=list(range(len(ids))),
+                elements=len(ids),
+                flags=[flags] * len(ids)
+            )
+        except hyperscan.error as e:
+            # Например, пустое ключевое слово: ищем без Hyperscan
+            print(f"Hyperscan не собрал базу ключевых слов ({e}), используется запасной поиск\n")
+            return None
+        
+        def on_match(expr_id, start, end, flags, hits):
+            hits.append((expr_id, start, end))
+        
+        def match(text: str) -> List[str]:
+            data = text.encode('utf-8')
+            hits = []
+            database.scan(data, match_event_handler=on_match, context=hits)
+            
+            found = set()
+            for expr_id, start, end in hits:
+                # Смещения Hyperscan в байтах, переводим в символы
+                char_start = len(data[:start].decode('utf-8'))
+                char_end = char_start + len(data[start:end].decode('utf-8'))
+                if _is_whole_word(text, char_start, char_end):
+                    found.update(ids[expr_id])
+            # Сохраняем порядок ключевых слов из конфигурации
+            return [keywords[i] for i in sorted(found)]
+        
+        return match
+    
+    def _build_regex_matcher(self, keywords: List[str]):
+        """Одно регулярное выражение-альтернатива на все ключевые слова"""
+        index = defaultdict(list)
+        for i, kw in enumerate(keywords):
+            index[kw.lower()].append(i)
+        
+        # Более длинные слова раньше: в каждой позиции берется самое длинное совпадение
+        ordered = sorted(index, key=len, reverse=True)
+        pattern = re.compile(r'(?=\b(' + '|'.join(map(re.escape, ordered)) + r')\b)')
+        
+        # Более короткие ключевые слова, которые целым словом начинают длинное
+        # (в той же позиции текста альтернатива их не вернет). Граница в начале
+        # у них общая с длинным словом, проверяем только границу в конце
+        nested = {
+            long_kw: [
+                short_kw for short_kw in ordered
+                if len(short_kw) < len(long_kw) and long_kw.startswith(short_kw)
+                and _is_word_char(long_kw, len(short_kw) - 1) != _is_word_char(long_kw, len(short_kw))
+            ]
+            for long_kw in ordered
+        }
+        
+        def match(text: str) -> List[str]:
+            found = set()
+            for m in pattern.finditer(text):
+                kw = m.group(1)
+                found.update(index[kw])
+                for short_kw in nested[kw]:
+                    found.update(index[short_kw])
+            # Сохраняем порядок ключевых слов из конфигурации
+            return [keywords[i] for i in sorted(found)]
+        
+        return match
+    
+    def _build_ahocorasick_matcher(self, keywords: List[str]):
+        """Автомат Ахо–Корасик: все ключевые слова за один проход по тексту"""
+        automaton = ahocorasick.Automaton()
+        
+        for i, kw in enumerate(keywords):
+            kw_lower = kw.lower()
+            # Разные ключевые слова могут совпадать в нижнем регистре
+            length, indices = automaton.get(kw_lower, (len(kw_lower), ()))
+            automaton.add_word(kw_lower, (length, indices + (i,)))
+        
+        automaton.make_automaton()
         
+        def match(text: str) -> List[str]:
+            found = set()
+            for end, (length, indices) in automaton.iter(text):
+                if _is_whole_word(text, end - length + 1, end + 1):
+                    found.update(indices)
+            # Сохраняем порядок ключевых слов из конфигурации
+            return [keywords[i] for i in sorted(found)]
+        
+        return match
+    
+    def _title_shingles(self, title: str) -> set:
+        """Символьные n-граммы заголовка для MinHash"""
+        text = ' '.join(title.lower().split())
+        if len(text) <= TITLE_SHINGLE_SIZE:
+            return {text}
+        return {text[i:i + TITLE_SHINGLE_SIZE] for i in range(len(text) - TITLE_SHINGLE_SIZE + 1)}
+    
+    def _title_numbers(self, title: str) -> set:
+        """Числа в заголовке: 'GPT-4' и 'GPT-5' — разные новости"""
+        return set(re.findall(r'\b\d+\b', title))
+    
+    def process_articles(self, articles: List[dict]) -> Tuple[List[dict], Dict[str, dict]]:
+        """Фильтрация, объединение похожих и группировка статей"""
         filters = self.feeds_config.get('filters', {})
         keywords = filters.get('keywords', [])
         exclude_keywords = filters.get('exclude_keywords', [])
+        threshold = filters.get('near_duplicate_threshold', NEAR_DUPLICATE_THRESHOLD)
         
-        if not keywords:
+        if keywords:
+            # Строим поиск один раз на весь запуск (целые слова, без учета регистра)
+            match_keywords = self._build_keyword_matcher(keywords)
+            match_excluded = self._build_keyword_matcher(exclude_keywords) if exclude_keywords else None
+        else:
             print("Фильтрация отключена (нет ключевых слов)\n")
-            for article in articles:
-                article['matched_keywords'] = []
-            return articles
-        
-        filtered = []
         
+        # Проход по всем статьям: исключения и ключевые слова по тексту
+        # в нижнем регистре, вычисленному один раз при загрузке фида
+        matched_articles = []
         for article in articles:
-            text = f"{article['title']} {article['description']}".lower()
-            
-            # Проверяем исключения (целые слова)
-            if exclude_keywords:
-                excluded = False
-                for kw in exclude_keywords:
-                    # Ищем целое слово с границами \b
-                    if re.search(r'\b' + re.escape(kw.lower()) + r'\b', text):
-                        excluded = True
-                        break
-                if excluded:
+            if keywords:
+                text = article['_text_lc']
+                if match_excluded is not None and match_excluded(text):
                     continue
-            
-            # Проверяем включения (целые слова)
-            matched = []
-            for kw in keywords:
-                # Ищем целое слово с границами \b
-                if re.search(r'\b' + re.escape(kw.lower()) + r'\b', text):
-                    matched.append(kw)
-            
-            if matched:
-                article['matched_keywords'] = matched
-                filtered.append(article)
+                matched = match_keywords(text)
+                if not matched:
+                    continue
+            else:
+                matched = []
+            article['matched_keywords'] = matched
+            matched_articles.append(article)
+        
+        if keywords:
+            print(f"Фильтрация: {len(matched_articles)} из {len(articles)} статей соответствуют критериям\n")
+        
+        lsh = None
+        minhashes = [None] * len(matched_articles)
+        if threshold and matched_articles:
+            if MinHashLSH is None:
+                print("Объединение похожих новостей пропущено (нет datasketch)\n")
+            else:
+                lsh = MinHashLSH(threshold=threshold, num_perm=MINHASH_NUM_PERM)
+                # Пустые и короткие заголовки похожи друг на друга по n-граммам,
+                # хотя это разные новости: их не объединяем
+                shingles = [self._title_shingles(a['title']) for a in matched_articles]
+                hashed = [i for i, title_shingles in enumerate(shingles)
+                          if len(title_shingles) >= TITLE_MIN_SHINGLES]
+                # MinHash для всей колонки заголовков разом: перестановки инициализируются
+                # один раз, а не для каждой статьи
+                for i, minhash in zip(hashed, MinHash.bulk(
+                    [[s.encode('utf-8') for s in shingles[i]] for i in hashed],
+                    num_perm=MINHASH_NUM_PERM
+                )):
+                    minhashes[i] = minhash
         
-        print(f"Фильтрация: {len(filtered)} из {len(articles)} статей соответствуют критериям\n")
-        return filtered
-    
-    def group_articles(self, articles: List[dict]) -> Dict[str, List[dict]]:
-        """Группировка статей по источникам и категориям"""
         groups = {
             'by_source': defaultdict(list),
             'by_category': defaultdict(list),
             'by_keyword': defaultdict(list)
         }
+        by_source, by_category, by_keyword = groups['by_source'], groups['by_category'], groups['by_keyword']
+        kept = []
+        signatures = {}  # индекс в kept → (MinHash, числа заголовка)
         
-        for article in articles:
-            groups['by_source'][article['source']].append(article)
-            groups['by_category'][article.get('category', 'unknown')].append(article)
+        # Проход по прошедшим фильтр: объединение похожих и группировка
+        for article, minhash in zip(matched_articles, minhashes):
+            if minhash is not None:
+                numbers = self._title_numbers(article['title'])
+                # LSH находит кандидатов приблизительно: проверяем оценку сходства
+                # и совпадение чисел в заголовках
+                similar = [
+                    j for j in lsh.query(minhash)
+                    if signatures[j][1] == numbers and signatures[j][0].jaccard(minhash) >= threshold
+                ]
+                if similar:
+                    # Первая статья кластера остается, остальные прикрепляются к ней
+                    representative = kept[min(similar)]
+                    representative.setdefault('duplicates', []).append({
+                        'title': article['title'],
+                        'url': article['url'],
+                        'source': article['source']
+                    })
+                    continue
+                signatures[len(kept)] = (minhash, numbers)
+                lsh.insert(len(kept), minhash)
             
-            # Группируем по ключевым словам
-            for keyword in article.get('matched_keywords', []):
-                groups['by_keyword'][keyword].append(article)
+            kept.append(article)
+            by_source[article['source']].append(article)
+            by_category[article.get('category', 'unknown')].append(article)
+            for keyword in article['matched_keywords']:
+                by_keyword[keyword].append(article)
+        
+        if lsh is not None:
+            print(f"Похожие новости: {len(matched_articles) - len(kept)} объединено, осталось {len(kept)}\n")
         
-        return groups
+        return kept, groups
     
     def generate_text_report(self, articles: List[dict], groups: dict) -> str:
         """Генерация человеко-читаемого текстового отчета"""
-        moscow_tz = pytz.timezone('Europe/Moscow')
-        timestamp = datetime.now(moscow_tz)
+        timestamp = self._now
         
-        report = f"""
+        # Собираем отчет из частей и склеиваем один раз в конце
+        parts = [f"""
 {'='*70}
 НОВОСТНОЙ ДАЙДЖЕСТ
 {'='*70}
@@ -255,106 +840,122 @@ class NewsAggregator:
 Источников: {len(groups['by_source'])}
 {'='*70}
 
-"""
+"""]
+        add = parts.append
         
         # Статистика по источникам
-        report += f"\n{'─'*70}\n"
-        report += "СТАТИСТИКА ПО ИСТОЧНИКАМ\n"
-        report += f"{'─'*70}\n\n"
+        add(f"\n{'─'*70}\n")
+        add("СТАТИСТИКА ПО ИСТОЧНИКАМ\n")
+        add(f"{'─'*70}\n\n")
         
         for source, source_articles in sorted(
             groups['by_source'].items(),
             key=lambda x: len(x[1]),
             reverse=True
         ):
-            report += f"  • {source:30} → {len(source_articles):3} статей\n"
+            add(f"  • {source:30} → {len(source_articles):3} статей\n")
         
         # Группировка по ключевым словам (топ-темы)
         if groups['by_keyword']:
-            report += f"\n\n{'─'*70}\n"
-            report += "ТОП ТЕМЫ (по упоминаниям ключевых слов)\n"
-            report += f"{'─'*70}\n\n"
+            add(f"\n\n{'─'*70}\n")
+            add("ТОП ТЕМЫ (по упоминаниям ключевых слов)\n")
+            add(f"{'─'*70}\n\n")
             
             for keyword, kw_articles in sorted(
                 groups['by_keyword'].items(),
                 key=lambda x: len(x[1]),
                 reverse=True
             )[:10]:  # Топ-10 тем
-                report += f"  📌 {keyword} → {len(kw_articles)} статей\n"
+                add(f"  📌 {keyword} → {len(kw_articles)} статей\n")
         
         # Все статьи по источникам
-        report += f"\n\n{'='*70}\n"
-        report += "ВСЕ СТАТЬИ (группировка по источникам)\n"
-        report += f"{'='*70}\n"
-        
-        for source, source_articles in sorted(groups['by_source'].items()):
-            report += f"\n{'─'*70}\n"
-            report += f"📰 {source.upper()} ({len(source_articles)} статей)\n"
-            report += f"{'─'*70}\n\n"
+        add(f"\n\n{'='*70}\n")
+        add("ВСЕ СТАТЬИ (группировка по источникам)\n")
+        add(f"{'='*70}\n")
+        
+        # Одна сортировка по дате на все статьи, затем раскладка по источникам
+        by_source = defaultdict(list)
+        for article in sorted(articles, key=itemgetter('_pub_dt'), reverse=True):
+            by_source[article['source']].append(article)
+        
+        for source, source_articles in sorted(by_source.items()):
+            add(f"\n{'─'*70}\n")
+            add(f"📰 {source.upper()} ({len(source_articles)} статей)\n")
+            add(f"{'─'*70}\n\n")
             
-            for i, article in enumerate(sorted(
-                source_articles,
-                key=lambda x: x['published'],
-                reverse=True
-            ), 1):
-                pub_time = datetime.fromisoformat(article['published'])
-                report += f"{i}. {article['title']}\n"
-                report += f"   🔗 {article['url']}\n"
-                report += f"   📅 {pub_time.strftime('%d.%m.%Y %H:%M')}\n"
+            for i, article in enumerate(source_articles, 1):
+                add(f"{i}. {article['title']}\n")
+                add(f"   🔗 {article['url']}\n")
+                add(f"   📅 {article['_pub_dt'].strftime('%d.%m.%Y %H:%M')}\n")
                 
                 if article.get('matched_keywords'):
-                    report += f"   🏷️  Темы: {', '.join(article['matched_keywords'])}\n"
+                    add(f"   🏷️  Темы: {', '.join(article['matched_keywords'])}\n")
                 
                 if article['description']:
                     desc = article['description'][:200].replace('\n', ' ')
-                    report += f"   📝 {desc}...\n"
+                    add(f"   📝 {desc}...\n")
                 
-                report += "\n"
+                add("\n")
         
         # Инструкция для анализа
-        report += f"\n{'='*70}\n"
-        report += "СЛЕДУЮЩИЙ ШАГ: АНАЛИЗ\n"
-        report += f"{'='*70}\n\n"
-        report += "Для кластеризации и оценки значимости:\n\n"
-        report += "1. Загрузите файл raw_articles_latest.json в чат с Claude\n"
-        report += "2. Загрузите файл criteria.yaml для контекста\n"
-        report += "3. Попросите Claude:\n"
-        report += '   "Проанализируй эти новости используя критерии из criteria.yaml.\n'
-        report += '    Сгруппируй по темам, оцени значимость каждой темы, создай отчет."\n\n'
-        report += "4. Claude создаст структурированный отчет с оценками\n"
-        report += "5. Сохраните результат как analyzed_digest_[дата].txt\n\n"
-        
-        return report
+        add(REPORT_FOOTER)
+        
+        return ''.join(parts)
+    
+    def write_raw_json(self, path: str, timestamp: str, articles: List[dict], groups: dict):
+        """Потоковая запись сырых данных: статьи сериализуются по одной"""
+        with open(path, 'wb') as f:
+            f.write(b'{"timestamp":' + orjson.dumps(timestamp))
+            f.write(b',"total_articles":' + orjson.dumps(len(articles)))
+            
+            # В памяти одновременно только одна сериализованная статья
+            f.write(b',"articles":[')
+            for i, article in enumerate(articles):
+                if i:
+                    f.write(b',')
+                f.write(orjson.dumps(public_fields(article)))
+            
+            f.write(b'],"groups":' + orjson.dumps({
+                'by_source': {k: len(v) for k, v in groups['by_source'].items()},
+                'by_category': {k: len(v) for k, v in groups['by_category'].items()},
+                'by_keyword': {k: len(v) for k, v in groups['by_keyword'].items()}
+            }) + b'}')
+    
+    def _link_latest(self, path: str, latest_path: str, data: bytes = None):
+        """Файл *_latest — жесткая ссылка на свежий отчет, без повторной записи"""
+        if os.path.exists(latest_path) and os.path.samefile(path, latest_path):
+            return  # повторный запуск в ту же минуту: ссылка уже на месте
+        
+        tmp_path = latest_path + '.tmp'
+        Path(tmp_path).unlink(missing_ok=True)
+        try:
+            os.link(path, tmp_path)
+        except OSError:
+            # ФС без жестких ссылок: пишем те же байты из памяти или копируем файл
+            if data is not None:
+                Path(tmp_path).write_bytes(data)
+            else:
+                shutil.copyfile(path, tmp_path)
+        # Подменяем атомарно: страница не увидит отсутствующий файл
+        os.replace(tmp_path, latest_path)
     
     def save_reports(self, articles: List[dict], groups: dict):
         """Сохранение всех отчетов"""
-        # Используем московское время для имен файлов
-        moscow_tz = pytz.timezone('Europe/Moscow')
-        timestamp = datetime.now(moscow_tz).strftime('%Y-%m-%d_%H-%M')
+        # Используем московское время запуска для имен файлов
+        timestamp = self._ts_str
         
-        # 1. Сохраняем сырые данные в JSON
+        # 1. Сохраняем сырые данные в JSON (компактно: файл для машинной обработки)
         json_path = f"reports/raw_articles_{timestamp}.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': timestamp,
-                'total_articles': len(articles),
-                'articles': articles,
-                'groups': {
-                    'by_source': {k: len(v) for k, v in groups['by_source'].items()},
-                    'by_category': {k: len(v) for k, v in groups['by_category'].items()},
-                    'by_keyword': {k: len(v) for k, v in groups['by_keyword'].items()}
-                }
-            }, f, ensure_ascii=False, indent=2)
+        self.write_raw_json(json_path, timestamp, articles, groups)
         
         # 2. Генерируем и сохраняем текстовый отчет
         text_report = self.generate_text_report(articles, groups)
         txt_path = f"reports/raw_digest_{timestamp}.txt"
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write(text_report)
+        text_data = text_report.encode('utf-8')
+        Path(txt_path).write_bytes(text_data)
         
         # 3. Обновляем latest.txt
-        with open("reports/latest.txt", 'w', encoding='utf-8') as f:
-            f.write(text_report)
+        self._link_latest(txt_path, "reports/latest.txt", text_data)
         
         # 4. Создаем краткий JSON для быстрого просмотра
         summary_path = f"reports/summary_{timestamp}.json"
@@ -386,20 +987,17 @@ class NewsAggregator:
                     'url': a['url'],
                     'published': a['published']
                 }
-                for a in sorted(
-                    articles,
-                    key=lambda x: x['published'],
-                    reverse=True
-                )[:10]
+                # Десять самых свежих без сортировки всего списка
+                for a in heapq.nlargest(10, articles, key=itemgetter('published'))
             ]
         }
         
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(summary_data, f, ensure_ascii=False, indent=2)
+        summary_bytes = orjson.dumps(summary_data, option=orjson.OPT_INDENT_2)
+        Path(summary_path).write_bytes(summary_bytes)
         
-        # 5. ВАЖНО: Создаем копии с фиксированными именами для веб-страницы
-        shutil.copy(summary_path, "reports/summary_latest.json")
-        shutil.copy(json_path, "reports/raw_articles_latest.json")
+        # 5. ВАЖНО: Создаем файлы с фиксированными именами для веб-страницы
+        self._link_latest(summary_path, "reports/summary_latest.json", summary_bytes)
+        self._link_latest(json_path, "reports/raw_articles_latest.json")
         
         print(f"{'='*70}")
         print(f"✓ Отчеты сохранены:")
@@ -415,33 +1013,45 @@ class NewsAggregator:
     
     def run(self):
         """Главный метод агрегатора"""
-        moscow_tz = pytz.timezone('Europe/Moscow')
+        self._set_run_time()
+        self._reset_feed_cache()
         print(f"\n{'='*70}")
         print(f"ЗАПУСК НОВОСТНОГО АГРЕГАТОРА")
         print(f"{'='*70}")
-        print(f"Время (МСК): {datetime.now(moscow_tz).strftime('%d.%m.%Y %H:%M:%S')}\n")
+        print(f"Время (МСК): {self._now.strftime('%d.%m.%Y %H:%M:%S')}\n")
     
-        # Собираем из RSS
         hours_back = self.feeds_config.get('filters', {}).get('hours_back', 24)
-        rss_articles = self.fetch_all_news(hours_back)
+        
+        # Загружаем все фиды (RSS и Google News) одним параллельным пакетом
+        urls = [d['url'] for d in self.get_enabled_feeds().values()]
+        urls += list(self.get_google_news_urls().values())
+        bodies = self.download_feeds(urls)
+        
+        # Собираем из RSS
+        rss_articles = self.fetch_all_news(hours_back, bodies)
         
         # Добавляем из Google News
-        google_articles = self.fetch_google_news(hours_back)
+        google_articles = self.fetch_google_news(hours_back, bodies)
         all_articles = rss_articles + google_articles
         
-        # Фильтруем
-        filtered_articles = self.filter_by_keywords(all_articles)
+        # Запоминаем ETag/Last-Modified и статьи для следующего запуска
+        self.save_feed_cache()
+        
+        # Фильтруем, объединяем одну и ту же новость из разных источников
+        # и группируем — за один проход по статьям
+        filtered_articles, groups = self.process_articles(all_articles)
         
         if not filtered_articles:
             print("✗ Нет статей после фильтрации\n")
             return
         
-        # Группируем
-        groups = self.group_articles(filtered_articles)
-        
         # Сохраняем
         json_path, txt_path = self.save_reports(filtered_articles, groups)
         
+        # URL считаются просмотренными, только когда отчеты уже записаны
+        if self.seen_urls is not None:
+            self.seen_urls.save(SEEN_URLS_PATH)
+        
         print("\nГотово! Следующие шаги:")
         print("1. Просмотрите reports/latest.txt для быстрого ознакомления")
         print(f"2. Загрузите reports/raw_articles_latest.json в Claude для анализа")